@@ -0,0 +1,33 @@
+import aiohttp
+
+_session = None
+
+def make_session():
+    """Create a ClientSession tuned for the Polymarket API hosts (small pool, long-lived DNS entries)"""
+    connector = aiohttp.TCPConnector(
+        limit=16, limit_per_host=8,
+        ttl_dns_cache=600, use_dns_cache=True,
+        keepalive_timeout=75, enable_cleanup_closed=True,
+    )
+    return aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=15))
+
+async def get_session():
+    """Return the ClientSession shared by the probe scripts, creating it on first use"""
+    global _session
+    if _session is None or _session.closed:
+        _session = make_session()
+    return _session
+
+async def close_session():
+    """Close the shared session (call once, when all probes are done)"""
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+
+async def run(probe):
+    """Await a probe coroutine, then close the shared session"""
+    try:
+        return await probe
+    finally:
+        await close_session()
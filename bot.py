@@ -1,11 +1,18 @@
 import asyncio
 import aiohttp
+import orjson
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import Application, CommandHandler, CallbackQueryHandler, ContextTypes, MessageHandler, filters
+from telegram.error import BadRequest, RetryAfter
 import json
 from datetime import datetime, timedelta
-from collections import defaultdict
+from collections import Counter, OrderedDict, defaultdict, deque
+import functools
+import heapq
 import os
+import re
+import sqlite3
+import time
 import logging
 from dotenv import load_dotenv
 
@@ -15,6 +22,10 @@ load_dotenv()
 # Securely load credentials - NEVER HARDCODE THESE
 TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
 NEWS_API_KEY = os.getenv("NEWS_API_KEY")
+# Optional private chat/channel: broadcasts are posted there once, then copied to subscribers
+STAGING_CHAT_ID = os.getenv("STAGING_CHAT_ID")
+# Subscribers, tracked wallets and seen markets survive restarts in this SQLite file
+STATE_DB_PATH = os.getenv("STATE_DB_PATH", "bot_state.db")
 
 # Builder API Credentials
 POLY_API_KEY = os.getenv("POLY_API_KEY")
@@ -33,17 +44,115 @@ POLYMARKET_API = "https://gamma-api.polymarket.com"
 DATA_API_URL = "https://data-api.polymarket.com"
 CLOB_API = "https://clob.polymarket.com"
 CHECK_INTERVAL = 60  # 60s Turbo Mode
+NEWS_API_URL = "https://newsapi.org/v2/everything"
+# Static NewsAPI query params; only 'q' varies per market
+NEWS_API_PARAMS = {
+    'apiKey': NEWS_API_KEY,
+    'language': 'en',
+    'sortBy': 'publishedAt',
+    'pageSize': 20
+}
 
 NEWS_CHECK_INTERVAL = 300  # 5 minutes for news
 MIN_LARGE_TRADE = 5000  # Minimum $5,000 for single wallet alert (whale movement)
 VOLUME_SPIKE_THRESHOLD = 0.10  # 10% spike in volume (insider movement)
 VOLUME_SPIKE_WINDOW = 600  # 10 minutes window
 PRICE_ALERT_THRESHOLD = 0.05  # 5% price movement
+HTTP_LIMIT_PER_HOST = 10  # Max open connections per API host
+MARKET_SCAN_CONCURRENCY = 20  # Max markets checked in parallel per insider scan
+MARKETS_SNAPSHOT_TTL = 30  # Monitors share one markets fetch per limit within this window (kept < CHECK_INTERVAL)
+WALLET_CACHE_TTL = 600  # Reuse wallet performance stats for 10 minutes
+TELEGRAM_SEND_CONCURRENCY = 25  # Stay under Telegram's ~30 msg/s global limit
+TELEGRAM_GLOBAL_RATE = 30  # Messages per second across all chats
+TELEGRAM_CHAT_RATE = 20 / 60  # Messages per second to a single chat (20/min)
+TELEGRAM_CHAT_BURST = 20
+TELEGRAM_MAX_MESSAGE_LEN = 4096  # Hard limit per message; new-market digests are split below it
+DEDUP_ROTATE_INTERVAL = 3600  # Alert/news ids are forgotten 1-2 hours after last seen
+
+# Alert preferences for new subscribers (all feeds on)
+DEFAULT_PREFS = {
+    'new_markets': True,
+    'insider_alerts': True,
+    'price_alerts': True,
+    'news_alerts': True,
+    'arbitrage_alerts': True
+}
+# Settings menu callback suffix (toggle_<name>) -> preference key
+TOGGLE_PREF_KEYS = {
+    'markets': 'new_markets',
+    'insider': 'insider_alerts',
+    'price': 'price_alerts',
+    'news': 'news_alerts'
+}
 
 # Market Quality Filters
 MIN_LIQUIDITY = 500
 MIN_VOLUME = 1000
-market_cache_cleanup_counter = 0
+MAX_TRACKED_EVENTS = 5000  # Most recently seen markets remembered by monitor_markets
+CLEANUP_INTERVAL = 300  # Trim in-memory caches every 5 minutes
+TRACKED_EVENT_RETENTION = 86400  # Persisted markets not seen in the snapshot for this long are deleted
+
+# News keyword extraction
+_STOP_WORDS = frozenset({'will', 'be', 'the', 'a', 'an', 'in', 'on', 'at', 'to', 'for', 'of', 'by', 'before', 'after', 'end', 'year', 'month', 'day'})
+_QUOTED_RE = re.compile(r'"([^"]+)"')
+_NUM_RE = re.compile(r'\d+')
+_PUNCT_RE = re.compile(r'[^\w\s]')
+
+# Terms that suggest news settles a market outcome
+_DECISIVE_TERMS = [
+    'announced', 'confirmed', 'official', 'declared', 'elected',
+    'won', 'lost', 'died', 'passed away', 'resigned', 'appointed',
+    'convicted', 'acquitted', 'sentenced', 'released', 'arrested',
+    'launched', 'cancelled', 'postponed', 'approved', 'rejected',
+    'signed', 'vetoed', 'broke', 'set record', 'surpassed',
+    'fired', 'hired', 'replaced', 'stepped down', 'retired'
+]
+_DECISIVE_RE = re.compile(r'\b(?:' + '|'.join(map(re.escape, _DECISIVE_TERMS)) + r')\b', re.I)
+
+# Power words for Degen/Insider news alerts (substring match, any case)
+_DEGEN_TERMS = ['insider', 'whale', 'massive', 'breakout', 'dump', 'pump', 'liquidation', 'smart money', 'leaked', 'confirmed', 'alpha']
+_DEGEN_RE = re.compile('|'.join(map(re.escape, _DEGEN_TERMS)), re.I)
+
+# Alert message templates (rendered with str.format_map)
+NEW_MARKET_TMPL = (
+    "{emoji} **NEW MARKET** - {category}{trending_tag}\n"
+    "━━━━━━━━━━━━━━\n\n"
+    "📊 **{question}**\n\n"
+    "{desc_block}"
+    "💰 **Vol**: ${volume:,.0f}   💧 **Liq**: ${liquidity:,.0f}\n"
+    "📈 **Yes**: {yes_price:.1%} | **No**: {no_price:.1%}\n"
+    "⏰ **Added**: {time_ago}\n\n"
+    "{end_block}"
+    "{tags_block}"
+    "\n🔗 [Trade Now](https://polymarket.com/event/{slug})"
+)
+NEWS_TMPL = (
+    "{tag}\n"
+    "━━━━━━━━━━━━━━\n"
+    "📊 **Market**: {question}\n\n"
+    "📰 **{title}**\n"
+    "{desc_block}"
+    "\n🎯 Relevance: `{relevance}%`{alpha_tag}"
+    "\n━━━━━━━━━━━━━━\n"
+    "🔗 [Read Article]({article_url})\n"
+    "💰 [Trade $100](https://polymarket.com/event/{slug})"
+)
+ARBITRAGE_TMPL = (
+    "⚖️ [ARBITRAGE ALERT]\n"
+    "━━━━━━━━━━━━━━\n"
+    "🎯 **Event**: {event}\n\n"
+    "💰 **Spread: {spread:.2f}% Profit**\n"
+    "━━━━━━━━━━━━━━\n"
+    "🔹 Buy {p_side} @ `{p_price:.2f}` (Polymarket)\n"
+    "🔹 Buy {k_side} @ `{k_price:.2f}` (Kalshi)\n"
+    "━━━━━━━━━━━━━━\n"
+    "🔗 [Trade Now]({url})"
+)
+
+@functools.lru_cache(maxsize=4096)
+def _iso_to_ts(value):
+    """Parse an API ISO-8601 timestamp into a unix epoch float (memoized, compared against time.time())"""
+    return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
 
 # Enable logging
 logging.basicConfig(
@@ -61,19 +170,181 @@ class TraderCategory:
     FINANCE = "Finance"
     ALL = "All Markets"
 
+class AsyncTokenBucket:
+    """Token bucket for pacing async callers to a steady rate.
+
+    acquire() waits until a token is available instead of letting callers
+    burst into the remote rate limit and back off after the fact.
+    """
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.last_refill = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, n=1):
+        # The lock keeps waiters in FIFO order
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+                self.last_refill = now
+                if self.tokens >= n:
+                    self.tokens -= n
+                    return
+                await asyncio.sleep((n - self.tokens) / self.rate)
+
+# First matching category wins; patterns anchor at word starts so that
+# e.g. "eth" matches "Ethereum" but not "whether"
+_CATEGORY_KEYWORDS = [
+    (TraderCategory.POLITICS, ('election', 'president', 'congress', 'senate', 'trump', 'biden', 'vote', 'political')),
+    (TraderCategory.CRYPTO, ('bitcoin', 'eth', 'crypto', 'btc', 'blockchain', 'solana')),
+    (TraderCategory.SPORTS, ('nfl', 'nba', 'mlb', 'world cup', 'super bowl', 'finals', 'championship')),
+    (TraderCategory.ENTERTAINMENT, ('movie', 'oscar', 'emmy', 'grammy', 'box office', 'netflix')),
+    (TraderCategory.FINANCE, ('stock', 'fed', 'rate', 'gdp', 'inflation', 'earnings')),
+]
+# One alternation per category; word start only, so plurals like "elections" still match
+_CATEGORY_PATTERNS = [
+    (category, re.compile(r'\b(?:' + '|'.join(map(re.escape, words)) + ')', re.I))
+    for category, words in _CATEGORY_KEYWORDS
+]
+
+@functools.lru_cache(maxsize=4096)
+def _categorize(question):
+    """Return the first category whose keywords appear in the question (memoized - questions repeat every tick)"""
+    for category, pattern in _CATEGORY_PATTERNS:
+        if pattern.search(question):
+            return category
+    return TraderCategory.ALL
+
+_CATEGORY_EMOJI = {
+    TraderCategory.POLITICS: "🏛️",
+    TraderCategory.CRYPTO: "₿",
+    TraderCategory.SPORTS: "⚽",
+    TraderCategory.ENTERTAINMENT: "🎬",
+    TraderCategory.FINANCE: "💹",
+    TraderCategory.ALL: "📊"
+}
+
+class DecayingSet:
+    """Set-like membership filter whose entries age out over time.
+
+    Keeps an active and a shadow generation and rotates them every
+    `rotate_after` seconds, so an id is forgotten one to two periods after
+    it was last added or looked up. Memory stays bounded by the ids seen in
+    that window instead of growing for the lifetime of the bot.
+    """
+    def __init__(self, rotate_after=DEDUP_ROTATE_INTERVAL):
+        self.rotate_after = rotate_after
+        self._active = set()
+        self._shadow = set()
+        self._rotated_at = time.monotonic()
+
+    def rotate(self):
+        """Drop the shadow generation if a rotation period has elapsed"""
+        elapsed = time.monotonic() - self._rotated_at
+        if elapsed < self.rotate_after:
+            return
+        self._shadow = self._active if elapsed < 2 * self.rotate_after else set()
+        self._active = set()
+        self._rotated_at = time.monotonic()
+
+    def add(self, item):
+        self.rotate()
+        self._active.add(item)
+
+    def __contains__(self, item):
+        self.rotate()
+        if item in self._active:
+            return True
+        if item in self._shadow:
+            # Still being seen - keep it alive for another period
+            self._active.add(item)
+            return True
+        return False
+
+    def __len__(self):
+        return len(self._active) + len(self._shadow - self._active)
+
+class StateStore:
+    """SQLite persistence for subscribers, tracked wallets and seen markets.
+
+    The bot keeps working from its in-memory dicts; this only loads them at
+    startup and writes through the (small, infrequent) changes.
+    """
+    def __init__(self, path=STATE_DB_PATH):
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS chats (chat_id INTEGER PRIMARY KEY, prefs_json TEXT NOT NULL);
+            CREATE TABLE IF NOT EXISTS tracked_wallets (wallet TEXT PRIMARY KEY, last_ts REAL NOT NULL);
+            CREATE TABLE IF NOT EXISTS tracked_events (market_id TEXT PRIMARY KEY, ts REAL NOT NULL);
+            CREATE INDEX IF NOT EXISTS idx_tracked_events_ts ON tracked_events (ts);
+        """)
+
+    def load_chats(self):
+        rows = self._conn.execute("SELECT chat_id, prefs_json FROM chats")
+        return {chat_id: {**DEFAULT_PREFS, **json.loads(prefs)} for chat_id, prefs in rows}
+
+    def save_chat(self, chat_id, prefs):
+        with self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO chats VALUES (?, ?)", (chat_id, json.dumps(prefs)))
+
+    def load_wallets(self):
+        return dict(self._conn.execute("SELECT wallet, last_ts FROM tracked_wallets"))
+
+    def save_wallet(self, wallet, last_ts):
+        with self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO tracked_wallets VALUES (?, ?)", (wallet, last_ts))
+
+    def delete_wallet(self, wallet):
+        with self._conn:
+            self._conn.execute("DELETE FROM tracked_wallets WHERE wallet = ?", (wallet,))
+
+    def load_events(self, limit):
+        """Return the `limit` most recently tracked markets, oldest first"""
+        rows = self._conn.execute(
+            "SELECT market_id, ts FROM tracked_events ORDER BY ts DESC LIMIT ?", (limit,)
+        ).fetchall()
+        return rows[::-1]
+
+    def save_events(self, events):
+        with self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO tracked_events VALUES (?, ?)", events)
+
+    def prune_events(self, before):
+        with self._conn:
+            self._conn.execute("DELETE FROM tracked_events WHERE ts < ?", (before,))
+
+    def close(self):
+        self._conn.close()
+
 class PolymarketBot:
     def __init__(self):
-        self.tracked_events = {}
+        self.state = StateStore()
+        self.tracked_events = OrderedDict(self.state.load_events(MAX_TRACKED_EVENTS))  # {market_id: tracked_at epoch}, LRU capped at MAX_TRACKED_EVENTS
+        self._unsaved_events = []  # (market_id, tracked_at) written to the state db once per tick
         # Changed to dict: {wallet: last_trade_timestamp}
-        self.tracked_wallets = {} 
+        self.tracked_wallets = self.state.load_wallets()
         self.insider_wallets = set()  # Wallets with large positions
         self.profitable_by_category = defaultdict(list)
-        self.chat_ids = {}  # {chat_id: preferences}
+        self.chat_ids = self.state.load_chats()  # {chat_id: preferences}
+        self._subscribers_by_pref = {key: set() for key in DEFAULT_PREFS}  # {pref: {chat_id}}
+        for chat_id, prefs in self.chat_ids.items():
+            for key, enabled in prefs.items():
+                if enabled:
+                    self._subscribers_by_pref.setdefault(key, set()).add(chat_id)
         self.last_prices = {}
-        self.tracked_news = set()  # Track sent news to avoid duplicates
-        self.market_keywords = {}  # {market_id: [keywords]}
-        self.market_volume_history = {}  # {market_id: [(timestamp, volume)]}
-        self.alerted_spikes = set()  # Track alerted spikes to avoid duplicates
+        self.tracked_news = DecayingSet()  # Track sent news to avoid duplicates
+        self.market_keywords = {}  # {market_id: ([keywords], [lowercased keywords])}
+        self._spike_windows = defaultdict(deque)  # {market_id: (timestamp, volume) samples newer than the spike window}
+        self._spike_baselines = {}  # {market_id: newest (timestamp, volume) at least one window old}
+        self.alerted_spikes = DecayingSet()  # Track alerted spikes to avoid duplicates
+        self._wallet_cache = {}  # {wallet: (fetched_at, stats)}
+        self._markets_cache = {}  # {limit: (fetched_at, markets)} shared by monitors
+        self._markets_locks = defaultdict(asyncio.Lock)  # {limit: lock} coalescing in-flight fetches
         
         # Initialize Authenticated Client (Backend Only)
         self.clob_client = None
@@ -104,32 +375,173 @@ class PolymarketBot:
             except Exception as e:
                 logger.error(f"Failed to init Builder API: {e}")
                 self.clob_client = None
+
+        # Shared HTTP session (created lazily on the running event loop)
+        self._session = None
+        # Bounds concurrent per-market checks during insider scans
+        self._market_sem = asyncio.Semaphore(MARKET_SCAN_CONCURRENCY)
+        # Bounds concurrent Telegram sends during broadcasts
+        self._tg_sem = asyncio.Semaphore(TELEGRAM_SEND_CONCURRENCY)
+        # Pace sends under Telegram's global and per-chat flood limits
+        self._tg_bucket = AsyncTokenBucket(TELEGRAM_GLOBAL_RATE, TELEGRAM_GLOBAL_RATE)
+        self._chat_buckets = defaultdict(lambda: AsyncTokenBucket(TELEGRAM_CHAT_RATE, TELEGRAM_CHAT_BURST))
+
+    async def _get_session(self):
+        """Return the shared aiohttp session, creating it on first use"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                # limit_per_host queues excess requests so concurrent
+                # scans don't trip Polymarket's per-host rate limits
+                connector=aiohttp.TCPConnector(
+                    limit=100,
+                    limit_per_host=HTTP_LIMIT_PER_HOST,
+                    ttl_dns_cache=300,
+                    keepalive_timeout=30,
+                    enable_cleanup_closed=True
+                ),
+                timeout=aiohttp.ClientTimeout(total=15)
+            )
+        return self._session
+
+    async def close(self):
+        """Release network resources on shutdown"""
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self.state.close()
         
+    def add_chat(self, chat_id):
+        """Subscribe a chat with the default preferences"""
+        if chat_id not in self.chat_ids:
+            self.chat_ids[chat_id] = dict(DEFAULT_PREFS)
+            for key, enabled in DEFAULT_PREFS.items():
+                if enabled:
+                    self._subscribers_by_pref[key].add(chat_id)
+            self.state.save_chat(chat_id, self.chat_ids[chat_id])
+
+    def toggle_pref(self, chat_id, key):
+        """Flip one alert preference for a chat and return the new value"""
+        prefs = self.chat_ids[chat_id]
+        prefs[key] = not prefs.get(key, True)
+        subscribers = self._subscribers_by_pref.setdefault(key, set())
+        if prefs[key]:
+            subscribers.add(chat_id)
+        else:
+            subscribers.discard(chat_id)
+        self.state.save_chat(chat_id, prefs)
+        return prefs[key]
+
+    def track_wallet(self, wallet, since):
+        """Start alerting on a wallet's trades newer than `since`"""
+        self.tracked_wallets[wallet] = since
+        self.state.save_wallet(wallet, since)
+
+    def untrack_wallet(self, wallet):
+        """Stop tracking a wallet; returns False if it wasn't tracked"""
+        if wallet not in self.tracked_wallets:
+            return False
+        del self.tracked_wallets[wallet]
+        self.state.delete_wallet(wallet)
+        return True
+
+    async def _send(self, context, chat_id, text, copy_of=None, **kwargs):
+        """Send a single message (or copy a staged one), paced and bounded by the Telegram send limits; returns the sent message"""
+        if copy_of is not None:
+            send = functools.partial(
+                context.bot.copy_message, chat_id=chat_id, from_chat_id=STAGING_CHAT_ID, message_id=copy_of
+            )
+        else:
+            send = functools.partial(context.bot.send_message, chat_id=chat_id, text=text, **kwargs)
+        
+        # Wait for the chat's budget before taking a global send slot
+        await self._chat_buckets[chat_id].acquire()
+        async with self._tg_sem:
+            await self._tg_bucket.acquire()
+            try:
+                return await send()
+            except RetryAfter as e:
+                # Flood control: wait as instructed (holding the slot) and retry once
+                delay = e.retry_after
+                if isinstance(delay, timedelta):
+                    delay = delay.total_seconds()
+                await asyncio.sleep(delay)
+                return await send()
+
+    async def _broadcast(self, context, text, pref_key=None, chat_ids=None, **kwargs):
+        """Send a message concurrently to every chat with pref_key enabled (all chats if None, or
+        just chat_ids if given); returns the chats that rejected its formatting"""
+        kwargs.setdefault('parse_mode', 'Markdown')
+        if chat_ids is not None:
+            chat_ids = list(chat_ids)
+        elif pref_key is None:
+            chat_ids = list(self.chat_ids)
+        else:
+            chat_ids = list(self._subscribers_by_pref.get(pref_key, ()))
+        
+        # With a staging chat, format and upload the message once and copy it to each subscriber.
+        # The staging chat gets every broadcast, so it goes through the same per-chat pacing and retry
+        copy_of = None
+        if STAGING_CHAT_ID and len(chat_ids) > 1:
+            try:
+                staged = await self._send(context, STAGING_CHAT_ID, text, **kwargs)
+                copy_of = staged.message_id
+            except Exception as e:
+                logger.error(f"Error staging {pref_key or 'alert'}, sending directly: {e}")
+        
+        results = await asyncio.gather(
+            *(self._send(context, chat_id, text, copy_of, **kwargs) for chat_id in chat_ids),
+            return_exceptions=True
+        )
+        rejected = []
+        for chat_id, result in zip(chat_ids, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error sending {pref_key or 'alert'} to {chat_id}: {result}")
+                if isinstance(result, BadRequest) and "parse entities" in str(result).lower():
+                    rejected.append(chat_id)
+        return rejected
+
     async def fetch_markets(self, limit=50):
         """Fetch Polymarket markets"""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f"{POLYMARKET_API}/markets",
-                    params={"limit": limit, "active": True}
-                ) as response:
-                    if response.status == 200:
-                        return await response.json()
+            session = await self._get_session()
+            async with session.get(
+                f"{POLYMARKET_API}/markets",
+                params={"limit": limit, "active": True}
+            ) as response:
+                if response.status == 200:
+                    return orjson.loads(await response.read())
         except Exception as e:
             logger.error(f"Error fetching markets: {e}")
         return []
 
+    async def get_markets_snapshot(self, ttl=MARKETS_SNAPSHOT_TTL, limit=50):
+        """Return recently fetched markets for this limit, refreshing them once the TTL expires"""
+        fetched_at, markets = self._markets_cache.get(limit, (0, []))
+        if markets and time.monotonic() - fetched_at < ttl:
+            return markets
+        
+        # Monitors fire together; the first one fetches, the rest wait and reuse it
+        async with self._markets_locks[limit]:
+            fetched_at, markets = self._markets_cache.get(limit, (0, []))
+            if markets and time.monotonic() - fetched_at < ttl:
+                return markets
+            
+            markets = await self.fetch_markets(limit)
+            if markets:
+                self._markets_cache[limit] = (time.monotonic(), markets)
+            return markets
+
     async def fetch_kalshi_markets(self, limit=100):
         """Fetch Kalshi markets for arbitrage comparison"""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    "https://api.elections.kalshi.com/trade-api/v2/markets",
-                    params={"limit": limit, "status": "active"}
-                ) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return data.get('markets', [])
+            session = await self._get_session()
+            async with session.get(
+                "https://api.elections.kalshi.com/trade-api/v2/markets",
+                params={"limit": limit, "status": "active"}
+            ) as response:
+                if response.status == 200:
+                    data = orjson.loads(await response.read())
+                    return data.get('markets', [])
         except Exception as e:
             logger.error(f"Error fetching Kalshi markets: {e}")
         return []
@@ -137,38 +549,59 @@ class PolymarketBot:
     async def fetch_market_trades(self, market_id, limit=100):
         """Fetch recent trades for a market"""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f"{POLYMARKET_API}/markets/{market_id}/trades",
-                    params={"limit": limit}
-                ) as response:
-                    if response.status == 200:
-                        return await response.json()
+            session = await self._get_session()
+            async with session.get(
+                f"{POLYMARKET_API}/markets/{market_id}/trades",
+                params={"limit": limit}
+            ) as response:
+                if response.status == 200:
+                    return orjson.loads(await response.read())
         except Exception as e:
             logger.error(f"Error fetching market trades: {e}")
         return []
     
+    def _get_cached_wallet(self, wallet_address, ttl=WALLET_CACHE_TTL):
+        """Return (hit, stats) for a wallet from the TTL cache"""
+        entry = self._wallet_cache.get(wallet_address)
+        if entry and time.time() - entry[0] < ttl:
+            return True, entry[1]
+        return False, None
+
+    def prune_wallet_cache(self, ttl=WALLET_CACHE_TTL):
+        """Drop wallet stats older than the TTL"""
+        now = time.time()
+        self._wallet_cache = {
+            w: entry for w, entry in self._wallet_cache.items()
+            if now - entry[0] < ttl
+        }
+
     async def fetch_wallet_activity(self, wallet_address):
         """Fetch comprehensive wallet activity using Builder API if available"""
+        hit, stats = self._get_cached_wallet(wallet_address)
+        if hit:
+            return stats
+
         try:
             # Use Authenticated API if available (Higher limits, faster)
             if self.clob_client:
-                # Running in thread because clob_client might be synchronous
+                # clob_client is synchronous - run any calls via loop.run_in_executor
                 # Simplify for now: use existing public API for trades as it returns rich data
                 # But could verify wallet existence or balances via CLOB here
                 pass
 
-            async with aiohttp.ClientSession() as session:
-                # Fetch trades
-                async with session.get(
-                    f"{POLYMARKET_API}/trades",
-                    params={"wallet": wallet_address, "limit": 500}
-                ) as response:
-                    if response.status == 200:
-                        trades = await response.json()
-                        return await self.analyze_wallet_performance(trades, wallet_address)
-                    else:
-                        logger.warning(f"API Error {response.status} fetching wallet {wallet_address}")
+            session = await self._get_session()
+            # Fetch trades
+            async with session.get(
+                f"{POLYMARKET_API}/trades",
+                params={"wallet": wallet_address, "limit": 500}
+            ) as response:
+                if response.status == 200:
+                    trades = orjson.loads(await response.read())
+                    stats = await self.analyze_wallet_performance(trades, wallet_address)
+                    self._wallet_cache[wallet_address] = (time.time(), stats)
+                    return stats
+                else:
+                    logger.warning(f"API Error {response.status} fetching wallet {wallet_address}")
         except Exception as e:
             logger.error(f"Error fetching wallet activity: {e}")
         return None
@@ -187,7 +620,6 @@ class PolymarketBot:
         total_losses = 0
         total_pnl = 0
         total_volume = 0
-        
         for trade in trades:
             # Determine if trade was profitable (simplified)
             outcome = trade.get('outcome', 0)
@@ -195,7 +627,9 @@ class PolymarketBot:
             amount = trade.get('amount', 0)
             price = trade.get('price', 0)
             market = trade.get('market', {})
-            category = self.categorize_market(market.get('question', ''))
+            question = market.get('question', '')
+            category = self.categorize_market(question)
+            stats = category_stats[category]
             
             # Calculate if position was winning
             is_win = (side == 'buy' and outcome > 0.5) or (side == 'sell' and outcome < 0.5)
@@ -203,17 +637,17 @@ class PolymarketBot:
             
             if is_win:
                 total_wins += 1
-                category_stats[category]['wins'] += 1
+                stats['wins'] += 1
             else:
                 total_losses += 1
-                category_stats[category]['losses'] += 1
+                stats['losses'] += 1
             
             total_pnl += pnl
             total_volume += amount
-            category_stats[category]['total_pnl'] += pnl
-            category_stats[category]['volume'] += amount
-            category_stats[category]['trades'] += 1
-            category_stats[category]['markets'].add(market.get('id'))
+            stats['total_pnl'] += pnl
+            stats['volume'] += amount
+            stats['trades'] += 1
+            stats['markets'].add(market.get('id'))
         
         total_trades = total_wins + total_losses
         hit_rate = (total_wins / total_trades * 100) if total_trades > 0 else 0
@@ -240,20 +674,7 @@ class PolymarketBot:
     
     def categorize_market(self, question):
         """Categorize market based on question"""
-        question_lower = question.lower()
-        
-        if any(word in question_lower for word in ['election', 'president', 'congress', 'senate', 'trump', 'biden', 'vote', 'political']):
-            return TraderCategory.POLITICS
-        elif any(word in question_lower for word in ['bitcoin', 'eth', 'crypto', 'btc', 'blockchain', 'solana']):
-            return TraderCategory.CRYPTO
-        elif any(word in question_lower for word in ['nfl', 'nba', 'mlb', 'world cup', 'super bowl', 'finals', 'championship']):
-            return TraderCategory.SPORTS
-        elif any(word in question_lower for word in ['movie', 'oscar', 'emmy', 'grammy', 'box office', 'netflix']):
-            return TraderCategory.ENTERTAINMENT
-        elif any(word in question_lower for word in ['stock', 'fed', 'rate', 'gdp', 'inflation', 'earnings']):
-            return TraderCategory.FINANCE
-        else:
-            return TraderCategory.ALL
+        return _categorize(question)
     
     def calculate_consistency(self, category_stats):
         """Calculate consistency score based on performance across categories"""
@@ -273,26 +694,32 @@ class PolymarketBot:
     
     async def detect_insider_movements(self, context: ContextTypes.DEFAULT_TYPE):
         """Detect insider movements: volume spikes or large single trades"""
-        markets = await self.fetch_markets(50)
-        current_time = datetime.now().timestamp()
+        markets = await self.get_markets_snapshot()
+        current_time = time.time()
         
         for market in markets:
             market_id = market.get('id')
             current_volume = market.get('volume24hr', 0)
             
-            # Initialize volume history for new markets
-            if market_id not in self.market_volume_history:
-                self.market_volume_history[market_id] = []
-            
-            # Add current volume snapshot
-            self.market_volume_history[market_id].append((current_time, current_volume))
-            
-            # Clean old history (keep last 24 hours)
-            self.market_volume_history[market_id] = [
-                (ts, vol) for ts, vol in self.market_volume_history[market_id]
-                if current_time - ts < 86400
-            ]
-            
+            # Add the current volume snapshot and slide the spike window: the newest
+            # sample at least one window old becomes the baseline check_volume_spike compares against
+            window = self._spike_windows[market_id]
+            window.append((current_time, current_volume))
+            while current_time - window[0][0] >= VOLUME_SPIKE_WINDOW:
+                self._spike_baselines[market_id] = window.popleft()
+        
+        # Run the per-market checks concurrently (bounded by the semaphore)
+        results = await asyncio.gather(
+            *(self._process_market(market, context) for market in markets),
+            return_exceptions=True
+        )
+        for market, result in zip(markets, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error checking market {market.get('id')}: {result}")
+    
+    async def _process_market(self, market, context):
+        """Run the insider checks for a single market"""
+        async with self._market_sem:
             # Check for volume spike (20-30%+ in 10 minutes)
             await self.check_volume_spike(market, context)
             
@@ -301,23 +728,21 @@ class PolymarketBot:
     
     async def check_volume_spike(self, market, context):
         """Detect sudden volume spikes (20-30%+ in 10 minutes)"""
-        market_id = market.get('id')
-        current_time = datetime.now().timestamp()
-        
-        if market_id not in self.market_volume_history or len(self.market_volume_history[market_id]) < 2:
+        # Nobody to alert - skip the trade fetch and message building
+        if not self._subscribers_by_pref.get('insider_alerts'):
             return
         
-        history = self.market_volume_history[market_id]
-        current_volume = history[-1][1]
-        
-        # Get volume from 10 minutes ago
-        ten_min_ago = current_time - VOLUME_SPIKE_WINDOW
-        old_volumes = [vol for ts, vol in history if ts <= ten_min_ago]
+        market_id = market.get('id')
+        current_time = time.time()
         
-        if not old_volumes:
+        # Volume from 10 minutes ago, maintained incrementally by detect_insider_movements
+        baseline = self._spike_baselines.get(market_id)
+        window = self._spike_windows.get(market_id)
+        if baseline is None or not window:
             return
         
-        old_volume = old_volumes[-1]
+        current_volume = window[-1][1]
+        old_volume = baseline[1]
         
         # Calculate spike percentage
         if old_volume > 0:
@@ -362,29 +787,24 @@ class PolymarketBot:
                 message += f"🔗 [Trade Now](https://polymarket.com/event/{market.get('slug', market_id)})"
                 
                 # Send alert
-                for chat_id, prefs in self.chat_ids.items():
-                    if prefs.get('insider_alerts', True):
-                        try:
-                            await context.bot.send_message(
-                                chat_id=chat_id,
-                                text=message,
-                                parse_mode='Markdown'
-                            )
-                        except Exception as e:
-                            logger.error(f"Error sending spike alert: {e}")
+                await self._broadcast(context, message, 'insider_alerts')
     
     async def check_large_trades(self, market, context):
         """Detect single wallet trades >$10,000"""
+        # Nobody to alert - skip the trade and wallet fetches entirely
+        if not self._subscribers_by_pref.get('insider_alerts'):
+            return
+        
         market_id = market.get('id')
         trades = await self.fetch_market_trades(market_id, 30)
-        current_time = datetime.now().timestamp()
+        current_time = time.time()
         
+        # Collect fresh large trades first so wallet lookups can run in parallel
+        large_trades = []
         for trade in trades:
             amount = trade.get('amount', 0)
             wallet = trade.get('wallet', '')
             timestamp = trade.get('timestamp', 0)
-            side = trade.get('side', 'buy')
-            price = trade.get('price', 0)
             
             # Check for large trades (>$5k) in last 10 minutes
             if amount >= MIN_LARGE_TRADE and (current_time - timestamp) < VOLUME_SPIKE_WINDOW:
@@ -394,50 +814,62 @@ class PolymarketBot:
                     continue
                 
                 self.alerted_spikes.add(trade_id)
-                
-                # Check wallet history to see if they're a known trader
-                wallet_stats = await self.fetch_wallet_activity(wallet)
-                
-                # Determine whale size emoji
-                whale_emoji = "🐋🐋🐋" if amount >= 50000 else "🐋🐋" if amount >= 20000 else "🐋"
-                
-                message = f"{whale_emoji} **WHALE ALERT - ${amount:,.0f} TRADE** {whale_emoji}\n"
-                message += f"━━━━━━━━━━━━━━\n\n"
-                message += f"📊 **Market**: {market.get('question', 'N/A')[:120]}\n\n"
-                message += f"💼 **Wallet**: `{wallet[:10]}...{wallet[-8:]}`\n"
-                message += f"💰 **Trade Size**: ${amount:,.0f}\n"
-                message += f"📈 **Side**: {side.upper()} @ {price:.3f}\n"
-                message += f"⏰ **Time**: {datetime.fromtimestamp(timestamp).strftime('%H:%M:%S')}\n\n"
-                
-                if wallet_stats:
-                    message += f"📊 **Trader Performance:**\n"
-                    message += f"  • Win Rate: {wallet_stats['hit_rate']:.1f}%\n"
-                    message += f"  • Total PnL: ${wallet_stats['total_pnl']:,.0f}\n"
-                    message += f"  • Total Trades: {wallet_stats['total_trades']}\n"
-                    message += f"  • ROI: {wallet_stats['roi']:.1f}%\n\n"
-                
-                # Get current market prices for context
-                current_yes = market.get('outcomePrices', [0.5])[0]
-                message += f"💹 **Current Market**: Yes {float(current_yes):.1%}\n\n"
-                
-                message += f"⚠️ **Whale movement detected - Monitor closely**\n"
-                message += f"🔗 [Trade Now](https://polymarket.com/?via=shiroe/event/{market.get('slug', market_id)})"
-                
-                # Send alert
-                for chat_id, prefs in self.chat_ids.items():
-                    if prefs.get('insider_alerts', True):
-                        try:
-                            await context.bot.send_message(
-                                chat_id=chat_id,
-                                text=message,
-                                parse_mode='Markdown'
-                            )
-                        except Exception as e:
-                            logger.error(f"Error sending whale alert: {e}")
+                large_trades.append(trade)
+        
+        if not large_trades:
+            return
+        
+        # Check wallet history to see if they're known traders (once per wallet)
+        unique_wallets = list(dict.fromkeys(t.get('wallet', '') for t in large_trades))
+        wallet_results = await asyncio.gather(
+            *(self.fetch_wallet_activity(w) for w in unique_wallets),
+            return_exceptions=True
+        )
+        stats_map = {
+            w: None if isinstance(r, Exception) else r
+            for w, r in zip(unique_wallets, wallet_results)
+        }
+        
+        for trade in large_trades:
+            wallet_stats = stats_map[trade.get('wallet', '')]
+            
+            amount = trade.get('amount', 0)
+            wallet = trade.get('wallet', '')
+            timestamp = trade.get('timestamp', 0)
+            side = trade.get('side', 'buy')
+            price = trade.get('price', 0)
+            
+            # Determine whale size emoji
+            whale_emoji = "🐋🐋🐋" if amount >= 50000 else "🐋🐋" if amount >= 20000 else "🐋"
+            
+            message = f"{whale_emoji} **WHALE ALERT - ${amount:,.0f} TRADE** {whale_emoji}\n"
+            message += f"━━━━━━━━━━━━━━\n\n"
+            message += f"📊 **Market**: {market.get('question', 'N/A')[:120]}\n\n"
+            message += f"💼 **Wallet**: `{wallet[:10]}...{wallet[-8:]}`\n"
+            message += f"💰 **Trade Size**: ${amount:,.0f}\n"
+            message += f"📈 **Side**: {side.upper()} @ {price:.3f}\n"
+            message += f"⏰ **Time**: {datetime.fromtimestamp(timestamp).strftime('%H:%M:%S')}\n\n"
+            
+            if wallet_stats:
+                message += f"📊 **Trader Performance:**\n"
+                message += f"  • Win Rate: {wallet_stats['hit_rate']:.1f}%\n"
+                message += f"  • Total PnL: ${wallet_stats['total_pnl']:,.0f}\n"
+                message += f"  • Total Trades: {wallet_stats['total_trades']}\n"
+                message += f"  • ROI: {wallet_stats['roi']:.1f}%\n\n"
+            
+            # Get current market prices for context
+            current_yes = market.get('outcomePrices', [0.5])[0]
+            message += f"💹 **Current Market**: Yes {float(current_yes):.1%}\n\n"
+            
+            message += f"⚠️ **Whale movement detected - Monitor closely**\n"
+            message += f"🔗 [Trade Now](https://polymarket.com/?via=shiroe/event/{market.get('slug', market_id)})"
+            
+            # Send alert
+            await self._broadcast(context, message, 'insider_alerts')
     
     async def monitor_price_alerts(self, context: ContextTypes.DEFAULT_TYPE):
         """Monitor price movements for alerts"""
-        markets = await self.fetch_markets(50)
+        markets = await self.get_markets_snapshot()
         
         some_markets = markets or []
         for market in some_markets:
@@ -460,28 +892,14 @@ class PolymarketBot:
                     message += f"💵 Volume: ${float(market.get('volume', 0)):,.0f}\n"
                     message += f"🔗 [Trade Now](https://polymarket.com/event/{market.get('slug', market_id)})"
                     
-                    for chat_id, prefs in self.chat_ids.items():
-                        if prefs.get('price_alerts', True):
-                            try:
-                                await context.bot.send_message(
-                                    chat_id=chat_id,
-                                    text=message,
-                                    parse_mode='Markdown'
-                                )
-                            except Exception as e:
-                                logger.error(f"Error: {e}")
+                    await self._broadcast(context, message, 'price_alerts')
             
             self.last_prices[market_id] = current_price
     
     def extract_market_keywords(self, question):
         """Extract key entities and terms from market question for news matching"""
-        import re
-        
-        # Remove common words
-        stop_words = {'will', 'be', 'the', 'a', 'an', 'in', 'on', 'at', 'to', 'for', 'of', 'by', 'before', 'after', 'end', 'year', 'month', 'day'}
-        
         # Extract quoted phrases (exact matches needed)
-        quoted = re.findall(r'"([^"]+)"', question)
+        quoted = _QUOTED_RE.findall(question)
         
         # Extract capitalized words (likely proper nouns/entities)
         words = question.split()
@@ -492,28 +910,27 @@ class PolymarketBot:
         
         # Add proper nouns and important terms
         for word in words:
-            cleaned = re.sub(r'[^\w\s]', '', word)
-            if cleaned and cleaned.lower() not in stop_words:
+            cleaned = _PUNCT_RE.sub('', word)
+            if cleaned and cleaned.lower() not in _STOP_WORDS:
                 if word and word[0].isupper() or len(cleaned) > 8:  # Proper nouns or long words
                     keywords.append(cleaned)
         
         # Add numbers (dates, amounts, etc.)
-        numbers = re.findall(r'\d+', question)
+        numbers = _NUM_RE.findall(question)
         keywords.extend(numbers)
         
-        return list(set(keywords))
+        # Deduplicate while keeping priority order (quoted phrases first)
+        return list(dict.fromkeys(keywords))
     
-    def calculate_news_relevance(self, news_title, news_description, keywords):
+    def calculate_news_relevance(self, news_title, news_description, keywords, keywords_lower):
         """Calculate how relevant news is to market (0-100 score)"""
         title_lower = news_title.lower()
         desc_lower = (news_description or '').lower()
-        combined = f"{title_lower} {desc_lower}"
         
         score = 0
         matches = []
         
-        for keyword in keywords:
-            keyword_lower = keyword.lower()
+        for keyword, keyword_lower in zip(keywords, keywords_lower):
             # Exact match in title = very relevant
             if keyword_lower in title_lower:
                 score += 30
@@ -533,32 +950,9 @@ class PolymarketBot:
     
     def is_outcome_decisive(self, news_title, news_description, market_question):
         """Determine if news could decisively impact market outcome"""
-        decisive_terms = [
-            'announced', 'confirmed', 'official', 'declared', 'elected', 
-            'won', 'lost', 'died', 'passed away', 'resigned', 'appointed',
-            'convicted', 'acquitted', 'sentenced', 'released', 'arrested',
-            'launched', 'cancelled', 'postponed', 'approved', 'rejected',
-            'signed', 'vetoed', 'broke', 'set record', 'surpassed',
-            'fired', 'hired', 'replaced', 'stepped down', 'retired'
-        ]
-        
-        combined = f"{news_title} {news_description or ''}".lower()
-        
-        # Check for decisive terms
-        has_decisive_term = any(term in combined for term in decisive_terms)
-        
-        # Check if news directly answers the market question
-        question_lower = market_question.lower()
-        
-        # Extract key question words
-        if 'will' in question_lower:
-            # Future prediction - news must confirm/deny the event
-            return has_decisive_term
-        elif 'did' in question_lower or 'has' in question_lower:
-            # Past event verification
-            return has_decisive_term
-        
-        return has_decisive_term
+        # Whether the question asks about a future ("will") or past ("did"/"has")
+        # event, the news must confirm or deny it with a decisive term
+        return bool(_DECISIVE_RE.search(f"{news_title} {news_description or ''}"))
     
     async def fetch_relevant_news(self, market):
         """Fetch news relevant to specific market"""
@@ -568,11 +962,12 @@ class PolymarketBot:
         question = market.get('question', '')
         market_id = market.get('id')
         
-        # Get or generate keywords for this market
+        # Get or generate keywords (and their lowercase forms) for this market
         if market_id not in self.market_keywords:
-            self.market_keywords[market_id] = self.extract_market_keywords(question)
+            extracted = self.extract_market_keywords(question)
+            self.market_keywords[market_id] = (extracted, [k.lower() for k in extracted])
         
-        keywords = self.market_keywords[market_id]
+        keywords, keywords_lower = self.market_keywords[market_id]
         
         if not keywords:
             return []
@@ -581,54 +976,46 @@ class PolymarketBot:
         search_query = ' OR '.join(keywords[:5])  # Use top 5 keywords
         
         try:
-            async with aiohttp.ClientSession() as session:
-                params = {
-                    'q': search_query,
-                    'apiKey': NEWS_API_KEY,
-                    'language': 'en',
-                    'sortBy': 'publishedAt',
-                    'pageSize': 20
-                }
-                
-                async with session.get(
-                    'https://newsapi.org/v2/everything',
-                    params=params
-                ) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        articles = data.get('articles', [])
+            session = await self._get_session()
+            async with session.get(
+                NEWS_API_URL,
+                params={**NEWS_API_PARAMS, 'q': search_query}
+            ) as response:
+                if response.status == 200:
+                    data = orjson.loads(await response.read())
+                    articles = data.get('articles', [])
+                    
+                    # Filter and score articles
+                    relevant_articles = []
+                    for article in articles:
+                        title = article.get('title', '')
+                        description = article.get('description', '')
                         
-                        # Filter and score articles
-                        relevant_articles = []
-                        for article in articles:
-                            title = article.get('title', '')
-                            description = article.get('description', '')
-                            
-                            # Calculate relevance
-                            relevance, matched_keywords = self.calculate_news_relevance(
-                                title, description, keywords
+                        # Calculate relevance
+                        relevance, matched_keywords = self.calculate_news_relevance(
+                            title, description, keywords, keywords_lower
+                        )
+                        
+                        # Only include highly relevant news (score > 40)
+                        if relevance > 40:
+                            # Check if it's outcome-decisive
+                            is_decisive = self.is_outcome_decisive(
+                                title, description, question
                             )
                             
-                            # Only include highly relevant news (score > 40)
-                            if relevance > 40:
-                                # Check if it's outcome-decisive
-                                is_decisive = self.is_outcome_decisive(
-                                    title, description, question
-                                )
-                                
-                                # Only alert on decisive news
-                                if is_decisive:
-                                    relevant_articles.append({
-                                        'article': article,
-                                        'relevance': relevance,
-                                        'matched_keywords': matched_keywords,
-                                        'is_decisive': is_decisive
-                                    })
-                        
-                        # Sort by relevance
-                        relevant_articles.sort(key=lambda x: x['relevance'], reverse=True)
-                        return relevant_articles[:3]  # Top 3 most relevant
-                        
+                            # Only alert on decisive news
+                            if is_decisive:
+                                relevant_articles.append({
+                                    'article': article,
+                                    'relevance': relevance,
+                                    'matched_keywords': matched_keywords,
+                                    'is_decisive': is_decisive
+                                })
+                    
+                    # Sort by relevance
+                    relevant_articles.sort(key=lambda x: x['relevance'], reverse=True)
+                    return relevant_articles[:3]  # Top 3 most relevant
+                    
         except Exception as e:
             logger.error(f"Error fetching news: {e}")
         
@@ -636,10 +1023,7 @@ class PolymarketBot:
     
     async def monitor_market_news(self, context: ContextTypes.DEFAULT_TYPE):
         """Monitor news with specialized Degen/Whale intelligence"""
-        markets = await self.fetch_markets(30)
-        
-        # Power words for Degen/Insider alerts
-        degen_terms = ['insider', 'whale', 'massive', 'breakout', 'dump', 'pump', 'liquidation', 'smart money', 'leaked', 'confirmed', 'alpha']
+        markets = (await self.get_markets_snapshot())[:30]
         
         for market in markets:
             market_id = market.get('id')
@@ -657,49 +1041,48 @@ class PolymarketBot:
                 
                 self.tracked_news.add(news_id)
                 
-                title_desc = f"{article.get('title', '')} {article.get('description', '')}".lower()
-                is_degen = any(word in title_desc for word in degen_terms)
+                title_desc = f"{article.get('title', '')} {article.get('description', '')}"
+                is_degen = bool(_DEGEN_RE.search(title_desc))
                 
                 # Tagging logic for high-importance news
                 tag = "🏴‍☠️ [DEGEN ALERT]" if is_degen else "🚨 [MARKET NEWS]"
                 
-                message = f"{tag}\n"
-                message += f"━━━━━━━━━━━━━━\n"
-                message += f"📊 **Market**: {question[:120]}\n\n"
-                message += f"📰 **{article.get('title', 'N/A')}**\n"
-                
-                if article.get('description'):
-                    message += f"\n_{article['description'][:180]}..._\n"
-                
-                message += f"\n🎯 Relevance: `{news_item['relevance']}%`"
-                if is_degen:
-                    message += f" | 🔥 **Alpha: High**"
-                
-                message += f"\n━━━━━━━━━━━━━━\n"
-                message += f"🔗 [Read Article]({article_url})\n"
-                message += f"💰 [Trade $100](https://polymarket.com/event/{market.get('slug', market_id)})"
+                description = article.get('description')
+                message = NEWS_TMPL.format_map({
+                    'tag': tag,
+                    'question': question[:120],
+                    'title': article.get('title', 'N/A'),
+                    'desc_block': f"\n_{description[:180]}..._\n" if description else "",
+                    'relevance': news_item['relevance'],
+                    'alpha_tag': " | 🔥 **Alpha: High**" if is_degen else "",
+                    'article_url': article_url,
+                    'slug': market.get('slug', market_id)
+                })
                 
                 # Broadcast
-                for chat_id, prefs in self.chat_ids.items():
-                    if prefs.get('news_alerts', True):
-                        try:
-                            await context.bot.send_message(
-                                chat_id=chat_id,
-                                text=message,
-                                parse_mode='Markdown',
-                                disable_web_page_preview=False
-                            )
-                        except Exception as e:
-                            logger.error(f"Error sending news: {e}")
+                await self._broadcast(context, message, 'news_alerts', disable_web_page_preview=True)
 
     async def monitor_arbitrage(self, context: ContextTypes.DEFAULT_TYPE):
         """Monitor for arbitrage opportunities between Polymarket and Kalshi"""
-        poly_markets = await self.fetch_markets(40)
+        poly_markets = await self.get_markets_snapshot(limit=40)
         kalshi_markets = await self.fetch_kalshi_markets(100)
         
         if not poly_markets or not kalshi_markets:
             return
 
+        # Convert Kalshi asks once per tick and index markets by title word
+        # (skipping short filler words and unpriced markets), so each Polymarket
+        # market only visits priced Kalshi markets it shares words with
+        km_prices = [(km.get('yes_ask', 0) / 100, km.get('no_ask', 0) / 100) for km in kalshi_markets]
+        kalshi_index = defaultdict(list)
+        for idx, km in enumerate(kalshi_markets):
+            km_yes, km_no = km_prices[idx]
+            if km_yes == 0 or km_no == 0:
+                continue
+            for token in set(km.get('title', '').lower().split()):
+                if len(token) > 2:
+                    kalshi_index[token].append(idx)
+
         opportunities = []
         for pm in poly_markets:
             pm_title = pm.get('question', '').lower()
@@ -707,18 +1090,14 @@ class PolymarketBot:
             pm_no = pm.get('outcomePrices', [0.5, 0.5])[1]
             
             # Simplified matching logic: find a Kalshi market that shares key words
-            pm_keywords = set(pm_title.split())
+            shared = Counter()
+            for token in set(pm_title.split()):
+                shared.update(kalshi_index.get(token, ()))
             
-            for km in kalshi_markets:
-                km_title = km.get('title', '').lower()
-                km_keywords = set(km_title.split())
-                
+            for idx in sorted(shared):
                 # If they share significant words
-                if len(pm_keywords.intersection(km_keywords)) >= 3:
-                    km_yes = (km.get('yes_ask', 0)) / 100
-                    km_no = (km.get('no_ask', 0)) / 100
-                    
-                    if km_yes == 0 or km_no == 0: continue
+                if shared[idx] >= 3:
+                    km_yes, km_no = km_prices[idx]
                     
                     # Cost of buying Yes on P and No on K
                     cost1 = pm_yes + km_no
@@ -743,46 +1122,31 @@ class PolymarketBot:
                         })
 
         for opp in opportunities:
-            msg = f"⚖️ [ARBITRAGE ALERT]\n"
-            msg += f"━━━━━━━━━━━━━━\n"
-            msg += f"🎯 **Event**: {opp['event'][:120]}\n\n"
-            msg += f"💰 **Spread: {opp['spread']:.2f}% Profit**\n"
-            msg += f"━━━━━━━━━━━━━━\n"
-            msg += f"🔹 Buy {opp['p_side']} @ `{opp['p_price']:.2f}` (Polymarket)\n"
-            msg += f"🔹 Buy {opp['k_side']} @ `{opp['k_price']:.2f}` (Kalshi)\n"
-            msg += f"━━━━━━━━━━━━━━\n"
-            msg += f"🔗 [Trade Now]({opp['url']})"
+            msg = ARBITRAGE_TMPL.format_map({**opp, 'event': opp['event'][:120]})
             
-            for chat_id, prefs in self.chat_ids.items():
-                if prefs.get('arbitrage_alerts', True):
-                    try:
-                        await context.bot.send_message(chat_id=chat_id, text=msg, parse_mode='Markdown')
-                    except Exception as e:
-                        logger.error(f"Error sending arbitrage: {e}")
+            await self._broadcast(context, msg, 'arbitrage_alerts')
     
+    def _track_event(self, market_id, tracked_at):
+        """Remember a market as seen at tracked_at, evicting the least recently seen one when full"""
+        self.tracked_events[market_id] = tracked_at
+        self._unsaved_events.append((market_id, tracked_at))
+        if len(self.tracked_events) > MAX_TRACKED_EVENTS:
+            self.tracked_events.popitem(last=False)
+
     async def monitor_markets(self, context: ContextTypes.DEFAULT_TYPE):
         """Monitor new markets with quality filtering and rich formatting"""
         # Increased limit to catch more concurrent new listings
-        markets = await self.fetch_markets(100)
-        current_time = datetime.now()
+        markets = await self.get_markets_snapshot(limit=100)
+        current_time = time.time()
+        new_blocks = []
         
-        # Periodic cache cleanup (every ~50 calls)
-        global market_cache_cleanup_counter
-        market_cache_cleanup_counter += 1
-        if market_cache_cleanup_counter > 50:
-            # Keep only last 24h of tracked events to prevent memory bloat
-            current_ts = current_time.timestamp()
-            self.tracked_events = {
-                k: v for k, v in self.tracked_events.items() 
-                if (current_time - v).total_seconds() < 86400
-            }
-            market_cache_cleanup_counter = 0
-            
         for market in markets:
             market_id = market.get('id')
             
-            # Skip if already tracked
+            # Skip if already tracked, refreshing its last-seen time in the LRU and the state db
             if market_id in self.tracked_events:
+                self.tracked_events.move_to_end(market_id)
+                self._track_event(market_id, current_time)
                 continue
             
             # Quality filters using constants
@@ -795,21 +1159,23 @@ class PolymarketBot:
             
             # Time-based filtering: only show markets created in last 6 hours
             created_at = market.get('createdAt')
+            hours_since_creation = None
             if created_at:
                 try:
                     # Handle diverse date formats if necessary, though isoformat usually works
-                    created_time = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
-                    hours_since_creation = (current_time - created_time.replace(tzinfo=None)).total_seconds() / 3600
-                    
-                    # Skip if market is older than 6 hours
-                    if hours_since_creation > 6:
-                        continue
+                    hours_since_creation = (current_time - _iso_to_ts(created_at)) / 3600
                 except Exception as e:
                     # If parsing fails, log warning but default to showing active markets
                     pass
             
+            # Skip if market is older than 6 hours. It can never pass this
+            # filter again, so remember it and reject it at the first check next tick
+            if hours_since_creation is not None and hours_since_creation > 6:
+                self._track_event(market_id, current_time)
+                continue
+            
             # Mark as tracked
-            self.tracked_events[market_id] = current_time
+            self._track_event(market_id, current_time)
             
             # Get market details
             question = market.get('question', 'N/A')
@@ -828,30 +1194,15 @@ class PolymarketBot:
                 yes_price = 0.5
                 no_price = 0.5
             
-            # Category emoji mapping
-            category_emoji = {
-                TraderCategory.POLITICS: "🏛️",
-                TraderCategory.CRYPTO: "₿",
-                TraderCategory.SPORTS: "⚽",
-                TraderCategory.ENTERTAINMENT: "🎬",
-                TraderCategory.FINANCE: "💹",
-                TraderCategory.ALL: "📊"
-            }
-            
-            emoji = category_emoji.get(category, "📊")
+            emoji = _CATEGORY_EMOJI.get(category, "📊")
             
             # Calculate time since creation string
             time_ago = "Recently"
-            if created_at:
-                try:
-                    created_time = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
-                    hours_ago = (current_time - created_time.replace(tzinfo=None)).total_seconds() / 3600
-                    if hours_ago < 1:
-                        time_ago = f"{int(hours_ago * 60)}m ago"
-                    else:
-                        time_ago = f"{int(hours_ago)}h ago"
-                except:
-                    pass
+            if hours_since_creation is not None:
+                if hours_since_creation < 1:
+                    time_ago = f"{int(hours_since_creation * 60)}m ago"
+                else:
+                    time_ago = f"{int(hours_since_creation)}h ago"
 
             # Detect if Trending (High volume quickly)
             # e.g. > $10k volume and created < 2 hours ago
@@ -861,71 +1212,122 @@ class PolymarketBot:
             
             trending_tag = " | 🔥 **TRENDING**" if is_trending else ""
             
-            # Build rich message
-            message = f"{emoji} **NEW MARKET** - {category}{trending_tag}\n"
-            message += f"━━━━━━━━━━━━━━\n\n"
-            message += f"📊 **{question}**\n\n"
-            
             # Description (shortened)
+            desc_block = ""
             if description and len(description) > 10:
                 # Remove markdown links or clean up if needed
                 clean_desc = description.replace('\n', ' ').strip()
                 desc_preview = clean_desc[:120] + "..." if len(clean_desc) > 120 else clean_desc
-                message += f"_{desc_preview}_\n\n"
-            
-            # Market stats
-            message += f"💰 **Vol**: ${volume:,.0f}   💧 **Liq**: ${liquidity:,.0f}\n"
-            message += f"📈 **Yes**: {yes_price:.1%} | **No**: {no_price:.1%}\n"
-            message += f"⏰ **Added**: {time_ago}\n\n"
+                desc_block = f"_{desc_preview}_\n\n"
             
             # End Date
+            end_block = ""
             if end_date and end_date != 'N/A':
                 try:
                     end_dt = datetime.fromisoformat(end_date.replace('Z', '+00:00'))
                     # Format: Dec 31
-                    message += f"🏁 **Ends**: {end_dt.strftime('%b %d')}\n"
+                    end_block = f"🏁 **Ends**: {end_dt.strftime('%b %d')}\n"
                 except:
                     pass
             
             # Add tags as hashtags
+            tags_block = ""
             if tags and len(tags) > 0:
                 tag_labels = [tag.get('label', '') for tag in tags[:3] if tag.get('label')]
                 if tag_labels:
                     hashtags = ' '.join([f"#{tag.replace(' ', '')}" for tag in tag_labels])
-                    message += f"\n🏷️ {hashtags}\n"
-
-            message += f"\n🔗 [Trade Now](https://polymarket.com/event/{slug})"
+                    tags_block = f"\n🏷️ {hashtags}\n"
             
-            # Broadcast
-            for chat_id, prefs in self.chat_ids.items():
-                if prefs.get('new_markets', True):
-                    try:
-                        await context.bot.send_message(
-                            chat_id=chat_id,
-                            text=message,
-                            parse_mode='Markdown',
-                            disable_web_page_preview=True
-                        )
-                    except Exception as e:
-                        logger.error(f"Error sending new market alert: {e}")
+            # Build rich message
+            message = NEW_MARKET_TMPL.format_map({
+                'emoji': emoji,
+                'category': category,
+                'trending_tag': trending_tag,
+                'question': question,
+                'desc_block': desc_block,
+                'volume': volume,
+                'liquidity': liquidity,
+                'yes_price': yes_price,
+                'no_price': no_price,
+                'time_ago': time_ago,
+                'end_block': end_block,
+                'tags_block': tags_block,
+                'slug': slug
+            })
+            new_blocks.append(message)
+        
+        # Persist this tick's newly seen and re-seen markets in one transaction
+        if self._unsaved_events:
+            self.state.save_events(self._unsaved_events)
+            self._unsaved_events = []
+        
+        if not new_blocks:
+            return
+        
+        # A single listing goes out as-is; bursts are coalesced into digests so
+        # each chat gets one message per ~4096 chars instead of one per market
+        separator = "\n\n"
+        parts = [new_blocks]
+        if len(new_blocks) > 1:
+            # Leave room for the longest header a part can get
+            header_room = len(f"🆕 **{len(new_blocks)} New Markets** ({len(new_blocks)}/{len(new_blocks)})\n\n")
+            parts, current, size = [], [], header_room
+            for block in new_blocks:
+                if current and size + len(separator) + len(block) > TELEGRAM_MAX_MESSAGE_LEN:
+                    parts.append(current)
+                    current, size = [], header_room
+                size += len(block) + (len(separator) if current else 0)
+                current.append(block)
+            parts.append(current)
+        
+        # Broadcast
+        for part_no, blocks in enumerate(parts, 1):
+            if len(new_blocks) == 1:
+                text = blocks[0]
+            else:
+                part_tag = f" ({part_no}/{len(parts)})" if len(parts) > 1 else ""
+                text = f"🆕 **{len(blocks)} New Markets**{part_tag}\n\n" + separator.join(blocks)
+            rejected = await self._broadcast(context, text, 'new_markets', disable_web_page_preview=True)
+            
+            # A stray _ * [ in one listing's text fails the whole digest's Markdown parse;
+            # resend that part listing by listing so only the malformed one is lost
+            if rejected and len(blocks) > 1:
+                for block in blocks:
+                    await self._broadcast(context, block, chat_ids=rejected, disable_web_page_preview=True)
 
 
+    async def cleanup_caches(self, context: ContextTypes.DEFAULT_TYPE):
+        """Trim per-market state and caches in one periodic pass"""
+        self.prune_wallet_cache()
+        self.alerted_spikes.rotate()
+        self.tracked_news.rotate()
+        self.state.prune_events(time.time() - TRACKED_EVENT_RETENTION)
+        
+        # Drop state for markets that left the active snapshot
+        markets = await self.get_markets_snapshot()
+        if not markets:
+            return  # Don't wipe state because of a failed fetch
+        active_ids = {m.get('id') for m in markets}
+        for state in (self.last_prices, self._spike_windows, self._spike_baselines, self.market_keywords):
+            for market_id in [k for k in state if k not in active_ids]:
+                del state[market_id]
+
     async def fetch_wallet_positions(self, wallet_address):
         """Fetch current open positions for a wallet via CLOB API"""
         try:
-            async with aiohttp.ClientSession() as session:
-                # Add auth headers if available
-                headers = {}
-                # if self.clob_client:
-                #     headers = self.clob_client._get_headers() # Pseudo-code
-                
-                async with session.get(
-                    f"{CLOB_API}/positions-on-map",
-                    params={"user": wallet_address},
-                    headers=headers
-                ) as response:
-                    if response.status == 200:
-                        return await response.json()
+            session = await self._get_session()
+            # Add auth headers if available
+            headers = {}
+            # if self.clob_client:
+            #     headers = self.clob_client._get_headers() # Pseudo-code
+            
+            async with session.get(
+                f"{CLOB_API}/positions-on-map",
+                params={"user": wallet_address},
+                headers=headers
+            ) as response:
+                if response.status == 200:
+                    return orjson.loads(await response.read())
         except Exception as e:
             logger.error(f"Error fetching positions for {wallet_address}: {e}")
         return []
@@ -965,44 +1367,63 @@ class PolymarketBot:
         if not self.tracked_wallets:
             return
 
-        for wallet, last_ts in self.tracked_wallets.items():
-            try:
-                # Fetch very recent trades
-                recent_trades = await self.fetch_market_trades_by_wallet(wallet, limit=10)
-                if not recent_trades: continue
-                
-                # Filter for new trades since last check
-                new_trades = [t for t in recent_trades if t.get('timestamp', 0) > last_ts]
+        # Check every tracked wallet concurrently (snapshot so /untrack can't break iteration)
+        await asyncio.gather(*(
+            self._check_tracked_wallet(context, wallet, last_ts)
+            for wallet, last_ts in list(self.tracked_wallets.items())
+        ))
+
+    async def _check_tracked_wallet(self, context, wallet, last_ts):
+        """Alert on new trades by a single tracked wallet"""
+        try:
+            # Fetch very recent trades
+            recent_trades = await self.fetch_market_trades_by_wallet(wallet, limit=10)
+            if not recent_trades: return
+            
+            # Filter for new trades since last check
+            new_trades = [t for t in recent_trades if t.get('timestamp', 0) > last_ts]
+            
+            if not new_trades: return
+            
+            # Update last timestamp (unless the wallet was untracked meanwhile)
+            latest_ts = max(t.get('timestamp', 0) for t in new_trades)
+            if wallet not in self.tracked_wallets:
+                return
+            self.tracked_wallets[wallet] = latest_ts
+            self.state.save_wallet(wallet, latest_ts)
+            
+            # Alert for each new trade
+            for trade in new_trades:
+                amount = trade.get('amount', 0)
+                if amount < 10: continue # Skip dust
                 
-                if not new_trades: continue
+                side = trade.get('side', 'BUY')
+                price = trade.get('price', 0)
+                question = trade.get('title', 'Unknown Market')  # Data API returns 'title'
+                slug = trade.get('slug', '')
                 
-                # Update last timestamp
-                latest_ts = max(t.get('timestamp', 0) for t in new_trades)
-                self.tracked_wallets[wallet] = latest_ts
+                msg = f"🔔 **WALLET ALERT**\n"
+                msg += f"━━━━━━━━━━━━━━\n"
+                msg += f"🕵️ `{wallet[:6]}...{wallet[-4:]}`\n"
+                msg += f"Action: **{side.upper()}** ${amount:,.0f}\n"
+                msg += f"Event: {question[:80]}\n"
+                msg += f"Price: {price:.2f}\n"
+                msg += f"🔗 [View Market](https://polymarket.com/event/{slug})"
                 
-                # Alert for each new trade
-                for trade in new_trades:
-                    amount = trade.get('amount', 0)
-                    if amount < 10: continue # Skip dust
-                    
-                    side = trade.get('side', 'BUY')
-                    price = trade.get('price', 0)
-                    question = trade.get('title', 'Unknown Market')  # Data API returns 'title'
-                    slug = trade.get('slug', '')
-                    
-                    msg = f"🔔 **WALLET ALERT**\n"
-                    msg += f"━━━━━━━━━━━━━━\n"
-                    msg += f"🕵️ `{wallet[:6]}...{wallet[-4:]}`\n"
-                    msg += f"Action: **{side.upper()}** ${amount:,.0f}\n"
-                    msg += f"Event: {question[:80]}\n"
-                    msg += f"Price: {price:.2f}\n"
-                    msg += f"🔗 [View Market](https://polymarket.com/event/{slug})"
-                    
-                    for chat_id, prefs in self.chat_ids.items():
-                        await context.bot.send_message(chat_id=chat_id, text=msg, parse_mode='Markdown', disable_web_page_preview=True)
+                await self._broadcast(context, msg, disable_web_page_preview=True)
 
-            except Exception as e:
-                logger.error(f"Error monitoring wallet {wallet}: {e}")
+        except Exception as e:
+            logger.error(f"Error monitoring wallet {wallet}: {e}")
+
+    async def _fetch_data_api_trades(self, params):
+        """Fetch one page of Data API trades"""
+        session = await self._get_session()
+        async with session.get(f"{DATA_API_URL}/trades", params=params) as resp:
+            if resp.status == 200:
+                trades = orjson.loads(await resp.read())
+                if isinstance(trades, list):
+                    return trades
+        return []
 
     async def fetch_market_trades_by_wallet(self, wallet, limit=20):
         """
@@ -1010,38 +1431,34 @@ class PolymarketBot:
         Merges results from both queries to ensure complete coverage.
         """
         try:
-            async with aiohttp.ClientSession() as session:
-                trades = []
-                
-                # 1. Fetch as Maker
-                try:
-                    async with session.get(f"{DATA_API_URL}/trades", params={"maker_address": wallet, "limit": limit}) as resp:
-                        if resp.status == 200:
-                            maker_trades = await resp.json()
-                            if isinstance(maker_trades, list):
-                                trades.extend(maker_trades)
-                except Exception as e:
-                    logger.error(f"Error fetching maker trades for {wallet}: {e}")
-
-                # 2. Fetch as Taker (Crucial for market orders)
-                try:
-                    async with session.get(f"{DATA_API_URL}/trades", params={"taker_address": wallet, "limit": limit}) as resp:
-                        if resp.status == 200:
-                            taker_trades = await resp.json()
-                            if isinstance(taker_trades, list):
-                                trades.extend(taker_trades)
-                except Exception as e:
-                    logger.error(f"Error fetching taker trades for {wallet}: {e}")
-                
-                # Deduplicate by match_id or transactionHash if available, else exact timestamp+market
-                # Data API trades usually have 'matchId' or similar. 
-                # Let's simple dict comp by unique ID if present, otherwise raw list might have dupes if self-trade (rare)
-                # For safety, let's return all and let the logic filter by timestamp handle it (it uses max timestamp)
-                # But we should sort them.
-                
-                trades.sort(key=lambda x: x.get('timestamp', 0), reverse=True)
-                return trades[:limit] # Return top N recent
-                
+            # Fetch as Maker and as Taker (crucial for market orders) in parallel
+            maker_trades, taker_trades = await asyncio.gather(
+                self._fetch_data_api_trades({"maker_address": wallet, "limit": limit}),
+                self._fetch_data_api_trades({"taker_address": wallet, "limit": limit}),
+                return_exceptions=True
+            )
+            
+            trades = []
+            for role, result in (("maker", maker_trades), ("taker", taker_trades)):
+                if isinstance(result, Exception):
+                    logger.error(f"Error fetching {role} trades for {wallet}: {result}")
+                else:
+                    trades.extend(result)
+            
+            # Deduplicate by matchId or transactionHash if available, else exact timestamp+market+side
+            # (the same fill shows up in both lists when the wallet traded with itself)
+            unique_trades = {}
+            for trade in trades:
+                key = (
+                    trade.get('matchId')
+                    or trade.get('transactionHash')
+                    or (trade.get('timestamp'), trade.get('market'), trade.get('side'))
+                )
+                unique_trades[key] = trade
+            
+            # Return top N recent without sorting everything
+            return heapq.nlargest(limit, unique_trades.values(), key=lambda x: x.get('timestamp', 0))
+            
         except Exception as e:
              logger.error(f"Exception fetching trades for {wallet}: {e}")
              return []
@@ -1060,9 +1477,8 @@ async def track_wallet_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
     
     wallet = context.args[0]
-    import time
     # Initialize with current time to only alert on FUTURE trades
-    bot_instance.tracked_wallets[wallet] = time.time()
+    bot_instance.track_wallet(wallet, time.time())
     await update.message.reply_text(f"✅ Now tracking `{wallet}` live. You will receive alerts for every new trade.")
 
 async def untrack_wallet_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -1072,8 +1488,7 @@ async def untrack_wallet_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE)
         return
     
     wallet = context.args[0]
-    if wallet in bot_instance.tracked_wallets:
-        del bot_instance.tracked_wallets[wallet]
+    if bot_instance.untrack_wallet(wallet):
         await update.message.reply_text(f"🗑️ Removed `{wallet}` from tracking.")
     else:
         await update.message.reply_text(f"❌ Wallet `{wallet}` is not being tracked.")
@@ -1142,14 +1557,7 @@ async def whales_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE):
 async def start_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Start command - Professional Terminal Style"""
     chat_id = update.effective_chat.id
-    if chat_id not in bot_instance.chat_ids:
-        bot_instance.chat_ids[chat_id] = {
-            'new_markets': True,
-            'insider_alerts': True,
-            'price_alerts': True,
-            'news_alerts': True,
-            'arbitrage_alerts': True
-        }
+    bot_instance.add_chat(chat_id)
     
     keyboard = [
         [InlineKeyboardButton("📊 NEW LISTINGS", callback_data='toggle_markets'), 
@@ -1184,16 +1592,9 @@ async def button_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
     
     if data.startswith('toggle_'):
         pref = data.replace('toggle_', '')
-        key_map = {
-            'markets': 'new_markets',
-            'insider': 'insider_alerts',
-            'price': 'price_alerts',
-            'news': 'news_alerts'
-        }
-        key = key_map.get(pref)
+        key = TOGGLE_PREF_KEYS.get(pref)
         if key:
-            bot_instance.chat_ids[chat_id][key] = not bot_instance.chat_ids[chat_id].get(key, True)
-            status = "ON" if bot_instance.chat_ids[chat_id][key] else "OFF"
+            status = "ON" if bot_instance.toggle_pref(chat_id, key) else "OFF"
             await query.edit_message_text(f"Settings updated: {pref.upper()} is now {status}")
             
     elif data == 'whales_menu':
@@ -1210,29 +1611,29 @@ async def search_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
     await update.message.reply_text(f"🔍 Searching for `{query}`...", parse_mode='Markdown')
     
-    async with aiohttp.ClientSession() as session:
-        async with session.get(f"{POLYMARKET_API}/markets", params={"search": query, "active": True, "limit": 5}) as resp:
-            if resp.status == 200:
-                markets = await resp.json()
-                if not markets:
-                    await update.message.reply_text("No markets found matching your query.")
-                    return
-                
-                msg = f"🔎 **Search Results for '{query}'**\n"
-                msg += "━━━━━━━━━━━━━━\n"
-                for m in markets:
-                    prices = m.get('outcomePrices', [0.5, 0.5])
-                    msg += f"📊 {m.get('question')[:80]}...\n"
-                    msg += f"💰 Yes: `{float(prices[0])*100:.0f}¢` | No: `{float(prices[1])*100:.0f}¢`\n"
-                    msg += f"🔗 [Trade Now](https://polymarket.com/event/{m.get('slug')})\n\n"
-                
-                await update.message.reply_text(msg, parse_mode='Markdown', disable_web_page_preview=True)
+    session = await bot_instance._get_session()
+    async with session.get(f"{POLYMARKET_API}/markets", params={"search": query, "active": True, "limit": 5}) as resp:
+        if resp.status == 200:
+            markets = orjson.loads(await resp.read())
+            if not markets:
+                await update.message.reply_text("No markets found matching your query.")
+                return
+            
+            msg = f"🔎 **Search Results for '{query}'**\n"
+            msg += "━━━━━━━━━━━━━━\n"
+            for m in markets:
+                prices = m.get('outcomePrices', [0.5, 0.5])
+                msg += f"📊 {m.get('question')[:80]}...\n"
+                msg += f"💰 Yes: `{float(prices[0])*100:.0f}¢` | No: `{float(prices[1])*100:.0f}¢`\n"
+                msg += f"🔗 [Trade Now](https://polymarket.com/event/{m.get('slug')})\n\n"
+            
+            await update.message.reply_text(msg, parse_mode='Markdown', disable_web_page_preview=True)
 
 async def signals_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Intelligence Signal Aggregator"""
     await update.message.reply_text("📡 Scoping Alpha signals...", parse_mode='Markdown')
     
-    markets = await bot_instance.fetch_markets(10)
+    markets = await bot_instance.get_markets_snapshot(limit=10)
     
     msg = "⚡ **POLYHAWK LIVE SIGNALS**\n"
     msg += "━━━━━━━━━━━━━━\n"
@@ -1255,13 +1656,17 @@ async def signals_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE):
     
     await update.message.reply_text(msg, parse_mode='Markdown')
 
+async def post_shutdown(application: Application):
+    """Close shared resources once the application stops"""
+    await bot_instance.close()
+
 def main():
     """Start the bot"""
     if not TELEGRAM_BOT_TOKEN:
         print("Error: TELEGRAM_BOT_TOKEN not found.")
         return
 
-    application = Application.builder().token(TELEGRAM_BOT_TOKEN).build()
+    application = Application.builder().token(TELEGRAM_BOT_TOKEN).post_shutdown(post_shutdown).build()
 
     # Register command handlers
     application.add_handler(CommandHandler("start", start_cmd))
@@ -1281,6 +1686,7 @@ def main():
     application.job_queue.run_repeating(bot_instance.monitor_market_news, interval=NEWS_CHECK_INTERVAL, first=40)
     application.job_queue.run_repeating(bot_instance.monitor_tracked_wallets, interval=600, first=60)
     application.job_queue.run_repeating(bot_instance.monitor_arbitrage, interval=600, first=50)
+    application.job_queue.run_repeating(bot_instance.cleanup_caches, interval=CLEANUP_INTERVAL, first=CLEANUP_INTERVAL)
     
     print("PolyHawk Bot: MISSION READY")
     application.run_polling()
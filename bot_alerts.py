@@ -1,11 +1,16 @@
 import asyncio
-import aiohttp
+import orjson
 from telegram import Update
 from telegram.ext import Application, CommandHandler, ContextTypes
+import html
 import os
+import random
 from dotenv import load_dotenv
-from datetime import datetime
+from api_client import make_session
+from collections import deque
 import logging
+import logging.handlers
+import queue
 
 # Load environment variables
 load_dotenv()
@@ -13,93 +18,261 @@ load_dotenv()
 # Configuration
 TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
 POLYMARKET_API = "https://gamma-api.polymarket.com/markets"
-CHECK_INTERVAL = 30  # Check every 30 seconds
+CHECK_INTERVAL = 10  # First poll interval; adapts to new-market arrivals from here
+MIN_CHECK_INTERVAL = 5  # Fastest polling, right after new markets appear
+MAX_CHECK_INTERVAL = 300  # Slowest polling during quiet periods
+INTERVAL_BACKOFF = 1.3  # Growth factor per quiet poll
+POLL_LIMIT = 20  # Markets requested on the first poll and after a burst
+STEADY_POLL_LIMIT = 5  # Markets requested per poll once caught up
+ERROR_BACKOFF_BASE = 30  # First retry delay after a failed poll; grows 1.5x per consecutive failure
+ERROR_BACKOFF_MAX = 300
+SEND_CONCURRENCY = 25  # Parallel sends, under Telegram's ~30 msg/s bot limit
+SEEN_MARKETS_MAX = 5000  # Market ids remembered; far more than the 20 newest we ever re-see
+MSG_TEMPLATE = (  # HTML: fields must be html.escape()d
+    "🆕 <b>JUST LISTED</b>\n"
+    "━━━━━━━━━━━━━━\n"
+    "📊 <b>{question}</b>\n\n"
+    "🔗 <a href=\"{url}\">Trade Now</a>"
+)
+STATE_PATH = os.getenv("ALERTS_STATE_PATH", "alerts_state.json")  # Seen ids + subscribers across restarts
 
-# Logging
+# Logging: records are queued on the event loop thread and written by a
+# listener thread, so a slow stderr never stalls sends
+_log_handler = logging.StreamHandler()
+_log_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+_log_queue = queue.SimpleQueue()
+log_listener = logging.handlers.QueueListener(_log_queue, _log_handler)
 logging.basicConfig(
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[logging.handlers.QueueHandler(_log_queue)],
     level=logging.INFO
 )
 logger = logging.getLogger(__name__)
 
+class FetchError(Exception):
+    """The markets poll failed (network error or unexpected status)"""
+
+class BoundedSet:
+    """Set that forgets its oldest entries once it holds more than maxlen items"""
+    def __init__(self, maxlen):
+        self._order = deque()
+        self._items = set()
+        self.maxlen = maxlen
+
+    def add(self, item):
+        if item in self._items:
+            return
+        self._items.add(item)
+        self._order.append(item)
+        if len(self._order) > self.maxlen:
+            self._items.discard(self._order.popleft())
+
+    def __contains__(self, item):
+        return item in self._items
+
+    def __len__(self):
+        return len(self._items)
+
+    def __iter__(self):
+        return iter(self._order)
+
+def _market_key(market_id):
+    """Compact seen-set key: Polymarket ids are numeric strings, so store them as ints"""
+    try:
+        return int(market_id)
+    except (TypeError, ValueError):
+        return market_id
+
+def _write_state(path, data):
+    """Atomically replace the state file (runs in a worker thread)"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(orjson.dumps(data))
+    os.replace(tmp_path, path)
+
 class NewMarketBot:
     def __init__(self):
-        self.seen_markets = set()
+        self.seen_markets = BoundedSet(SEEN_MARKETS_MAX)
         self.first_run = True
+        self.chat_ids = set()  # Subscribers restored from the state file
+        self._saved_chat_ids = set()
+        self.load_state()
+        self.current_interval = CHECK_INTERVAL
+        self._session = None
+        self._send_sem = asyncio.Semaphore(SEND_CONCURRENCY)
+        self._logged_encoding = False
+        self._consec_errors = 0  # Failed polls in a row, drives the retry backoff
+        self._etags = {}  # {limit: ETag of the last market list}, for conditional polls
 
-    async def fetch_markets(self):
-        """Fetch newest markets from Polymarket"""
+    async def _get_session(self):
+        """Return the shared HTTP session, creating it on first use"""
+        if self._session is None or self._session.closed:
+            self._session = make_session()
+        return self._session
+
+    async def close(self):
+        """Close the shared HTTP session on shutdown"""
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def load_state(self):
+        """Restore seen markets and subscribers saved by a previous run"""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    POLYMARKET_API,
-                    params={
-                        "limit": 20,
-                        "active": "true",
-                        "order": "createdAt",  # Sort by creation time
-                        "ascending": "false"   # Newest first
-                    }
-                ) as response:
-                    if response.status == 200:
-                        return await response.json()
+            with open(STATE_PATH, 'rb') as f:
+                state = orjson.loads(f.read())
+        except FileNotFoundError:
+            return
         except Exception as e:
-            logger.error(f"Error fetching markets: {e}")
-        return []
-
-    async def monitor_markets(self, context: ContextTypes.DEFAULT_TYPE):
-        """Check for new markets and alert"""
-        markets = await self.fetch_markets()
-        
-        # On first run, just mark everything as seen to avoid spam
-        if self.first_run:
-            for market in markets:
-                self.seen_markets.add(market.get('id'))
-            self.first_run = False
-            logger.info(f"✅ Bot initialized. Tracking {len(self.seen_markets)} existing markets.")
+            logger.error(f"Error loading state from {STATE_PATH}: {e}")
             return
+        for market_id in state.get('seen', []):
+            self.seen_markets.add(_market_key(market_id))
+        self.chat_ids = set(state.get('chats', []))
+        self._saved_chat_ids = set(self.chat_ids)
+        # Markets listed while we were down are genuinely new, so don't re-seed -
+        # unless the file was written before the first poll and holds no seen ids
+        if self.seen_markets:
+            self.first_run = False
+        logger.info(f"✅ Restored {len(self.seen_markets)} seen markets and {len(self.chat_ids)} chats.")
 
-        # Check for new markets
-        for market in markets:
-            market_id = market.get('id')
+    async def save_state(self, chat_ids):
+        """Write seen markets and subscribers to disk without blocking the event loop"""
+        # Until the first poll has seeded seen_markets there is nothing to remember
+        seen = [] if self.first_run else list(self.seen_markets)
+        state = {'seen': seen, 'chats': list(chat_ids)}
+        try:
+            await asyncio.to_thread(_write_state, STATE_PATH, state)
+            self._saved_chat_ids = set(chat_ids)
+        except Exception as e:
+            logger.error(f"Error saving state to {STATE_PATH}: {e}")
+
+    async def fetch_markets(self, limit=POLL_LIMIT):
+        """Fetch newest markets from Polymarket (None if unchanged since the last poll)
+
+        Raises FetchError on network errors or unexpected statuses.
+        """
+        try:
+            session = await self._get_session()
+            async with session.get(
+                POLYMARKET_API,
+                params={
+                    "limit": limit,
+                    "active": "true",
+                    "order": "createdAt",  # Sort by creation time
+                    "ascending": "false"   # Newest first
+                },
+                headers={"If-None-Match": self._etags[limit]} if limit in self._etags else {}
+            ) as response:
+                if response.status == 304:
+                    self._consec_errors = 0
+                    return None
+                if response.status == 200:
+                    if not self._logged_encoding:
+                        # aiohttp negotiates gzip/deflate (and br via the Brotli requirement) itself
+                        logger.info(f"Markets response Content-Encoding: {response.headers.get('Content-Encoding', 'identity')}")
+                        self._logged_encoding = True
+                    etag = response.headers.get("ETag")
+                    if etag:
+                        self._etags[limit] = etag
+                    markets = await response.json(loads=orjson.loads)
+                    self._consec_errors = 0
+                    return markets
+                error = f"HTTP {response.status}"
+        except Exception as e:
+            error = e
+        self._consec_errors += 1
+        raise FetchError(f"Error fetching markets: {error}")
+
+    async def monitor_markets(self, context: ContextTypes.DEFAULT_TYPE):
+        """Check for new markets and alert, then schedule the next check"""
+        delay = None
+        try:
+            limit = POLL_LIMIT if self.first_run else STEADY_POLL_LIMIT
+            markets = await self.fetch_markets(limit)
+            if markets is None:
+                markets = []  # 304 Not Modified: nothing new, counts as a quiet poll
             
-            if market_id not in self.seen_markets:
+            # Every market in the short poll is new, so more may be hiding behind it
+            if (not self.first_run and len(markets) >= limit
+                    and not any(_market_key(market.get('id')) in self.seen_markets for market in markets)):
+                try:
+                    markets = await self.fetch_markets(POLL_LIMIT) or markets
+                except FetchError as e:
+                    logger.warning(f"{e}; alerting from the short poll only")
+            
+            # On first run, just mark everything as seen to avoid spam
+            if self.first_run:
+                for market in markets:
+                    self.seen_markets.add(_market_key(market.get('id')))
+                self.first_run = False
+                logger.info(f"✅ Bot initialized. Tracking {len(self.seen_markets)} existing markets.")
+                await self.save_state(context.bot_data.get('chat_ids', ()))
+                return
+
+            # Check for new markets
+            found_new = False
+            for market in markets:
+                market_id = _market_key(market.get('id'))
+                
+                # Newest first: everything after the first seen id is older and seen too
+                if market_id in self.seen_markets:
+                    break
                 self.seen_markets.add(market_id)
+                found_new = True
+                
+                # Render the alert once, at detection time; send_alert only fans it out
+                slug = market.get('slug', '')
+                # Handle cases where slug might be missing or ID used
+                market['_url'] = f"https://polymarket.com/event/{slug}" if slug else "https://polymarket.com"
+                market['_msg'] = MSG_TEMPLATE.format(
+                    question=html.escape(market.get('question', 'Unknown Market')),
+                    url=html.escape(market['_url'])
+                )
                 await self.send_alert(context, market)
+            
+            # New listings tend to arrive in bursts: poll faster after a hit,
+            # back off gradually while nothing is happening
+            if found_new:
+                self.current_interval = max(MIN_CHECK_INTERVAL, self.current_interval / 2)
+            else:
+                self.current_interval = min(MAX_CHECK_INTERVAL, self.current_interval * INTERVAL_BACKOFF)
+            
+            chat_ids = context.bot_data.get('chat_ids', set())
+            if found_new or chat_ids != self._saved_chat_ids:
+                await self.save_state(chat_ids)
+        except FetchError as e:
+            # Back off exponentially (with jitter) while the API is failing
+            delay = min(ERROR_BACKOFF_MAX, ERROR_BACKOFF_BASE * 1.5 ** self._consec_errors)
+            delay *= random.uniform(0.8, 1.2)
+            logger.error(f"{e} ({self._consec_errors} in a row), retrying in {delay:.0f}s")
+        finally:
+            context.job_queue.run_once(self.monitor_markets, delay if delay is not None else self.current_interval)
 
     async def send_alert(self, context: ContextTypes.DEFAULT_TYPE, market):
-        """Send formatted alert to all users"""
-        question = market.get('question', 'Unknown Market')
-        slug = market.get('slug', '')
-        # Handle cases where slug might be missing or ID used
-        url = f"https://polymarket.com/event/{slug}" if slug else "https://polymarket.com"
-        
-        # Try to parse creation time for "Just now" effect
-        created_at = market.get('createdAt')
-        
-        msg = f"🆕 **JUST LISTED**\n"
-        msg += f"━━━━━━━━━━━━━━\n"
-        msg += f"📊 **{question}**\n\n"
-        msg += f"🔗 [Trade Now]({url})"
-
-        # Send to all users who started the bot
-        # Note: In a real prod bot we'd use a database. 
-        # For simplicity, we broadcast to the current chat if triggered, 
-        # but since this is a job, we need a stored chat_id. 
-        # We'll use a globally stored chat_id from the /start command.
-        
-        # Access the global chat_ids set from the application context if possible, 
-        # or simplified global list for this script
+        """Send a market's pre-rendered alert (market['_msg']) to all users"""
+        msg = market['_msg']
+
+        # Send to all users who started the bot: /start adds the chat to
+        # bot_data['chat_ids'], which is restored from and saved to the state file
         if 'chat_ids' in context.bot_data:
-            for chat_id in context.bot_data['chat_ids']:
-                try:
-                    await context.bot.send_message(
-                        chat_id=chat_id, 
-                        text=msg, 
-                        parse_mode='Markdown',
-                        disable_web_page_preview=True
-                    )
-                except Exception as e:
-                    logger.error(f"Failed to send to {chat_id}: {e}")
+            chat_ids = list(context.bot_data['chat_ids'])
+            results = await asyncio.gather(
+                *(self._send(context, chat_id, msg) for chat_id in chat_ids),
+                return_exceptions=True
+            )
+            for chat_id, result in zip(chat_ids, results):
+                if isinstance(result, Exception):
+                    logger.error(f"Failed to send to {chat_id}: {result}")
+
+    async def _send(self, context, chat_id, msg):
+        """Send one alert, bounded by the shared send semaphore"""
+        async with self._send_sem:
+            await context.bot.send_message(
+                chat_id=chat_id, 
+                text=msg, 
+                parse_mode='HTML',
+                disable_web_page_preview=True
+            )
 
 async def start_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Start command"""
@@ -122,14 +295,30 @@ def main():
         print("❌ Error: TELEGRAM_BOT_TOKEN not found in .env")
         return
 
-    application = Application.builder().token(TELEGRAM_BOT_TOKEN).build()
+    # Faster libuv-based event loop when available; run_polling picks up the policy
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+
+    log_listener.start()
     bot_instance = NewMarketBot()
 
+    async def post_shutdown(application):
+        await bot_instance.save_state(application.bot_data.get('chat_ids', ()))
+        await bot_instance.close()
+        log_listener.stop()  # Flushes queued records
+
+    application = Application.builder().token(TELEGRAM_BOT_TOKEN).post_shutdown(post_shutdown).build()
+    application.bot_data['chat_ids'] = set(bot_instance.chat_ids)
+
     # Handlers
     application.add_handler(CommandHandler("start", start_cmd))
 
     # Jobs
-    application.job_queue.run_repeating(bot_instance.monitor_markets, interval=CHECK_INTERVAL, first=5)
+    # monitor_markets reschedules itself with an adaptive interval
+    application.job_queue.run_once(bot_instance.monitor_markets, 5)
 
     print("🦅 Bot is running...")
     application.run_polling()
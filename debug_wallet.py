@@ -1,51 +1,46 @@
+import argparse
 import asyncio
-import aiohttp
+from api_client import get_session, run
+import orjson
 
 DATA_API = "https://data-api.polymarket.com"
 WALLET = "0xF734740627733Bda64fe6a69f81caBA96e3d7382"
 
-async def check_wallet_activity():
-    async with aiohttp.ClientSession() as session:
-        print(f"Checking wallet: {WALLET}")
-        
-        # 1. Check as Maker
-        print("\n--- Checking as Maker (maker_address) ---")
-        try:
-            async with session.get(f"{DATA_API}/trades", params={"maker_address": WALLET, "limit": 5}) as resp:
-                if resp.status == 200:
-                    data = await resp.json()
-                    print(f"Maker trades found: {len(data)}")
-                    if data: print(f"Sample: {data[0].get('side')} {data[0].get('size')} shares")
-                else:
-                    print(f"Error: {resp.status}")
-        except Exception as e:
-            print(e)
-            
-        # 2. Check as Taker (taker_address) - if supported
-        print("\n--- Checking as Taker (taker_address) ---")
-        try:
-            async with session.get(f"{DATA_API}/trades", params={"taker_address": WALLET, "limit": 5}) as resp:
-                if resp.status == 200:
-                    data = await resp.json()
-                    print(f"Taker trades found: {len(data)}")
-                    if data: print(f"Sample: {data[0].get('side')} {data[0].get('size')} shares")
-                else:
-                    print(f"Error {resp.status}: {await resp.text()}")
-        except Exception as e:
-            print(e)
+async def probe(session, params, label):
+    """Query /trades with one wallet filter; returns (label, status, data or error text)"""
+    async with session.get(f"{DATA_API}/trades", params=params) as resp:
+        if resp.status == 200:
+            return label, resp.status, orjson.loads(await resp.read())
+        return label, resp.status, await resp.text()
 
-        # 3. Check generic 'user' param (might cover both)
-        print("\n--- Checking as User (user) ---")
-        try:
-            async with session.get(f"{DATA_API}/trades", params={"user": WALLET, "limit": 5}) as resp:
-                if resp.status == 200:
-                    data = await resp.json()
-                    print(f"User trades found: {len(data)}")
-                    if data: print(f"Sample: {data[0].get('side')} {data[0].get('size')} shares")
-                else:
-                    print(f"Error {resp.status}: {await resp.text()}")
-        except Exception as e:
-            print(e)
+async def check_wallet_activity(full=False):
+    session = await get_session()
+    print(f"Checking wallet: {WALLET}")
+    
+    # The generic 'user' param covers both sides; with --full also fire the
+    # Maker and Taker (if supported) probes, all at once
+    probes = [("User", "user")]
+    if full:
+        probes = [("Maker", "maker_address"), ("Taker", "taker_address")] + probes
+    results = await asyncio.gather(
+        *(probe(session, {param: WALLET, "limit": 5}, label) for label, param in probes),
+        return_exceptions=True
+    )
+    
+    for (label, param), result in zip(probes, results):
+        print(f"\n--- Checking as {label} ({param}) ---")
+        if isinstance(result, Exception):
+            print(result)
+            continue
+        _, status, data = result
+        if status == 200:
+            print(f"{label} trades found: {len(data)}")
+            if data: print(f"Sample: {data[0].get('side')} {data[0].get('size')} shares")
+        else:
+            print(f"Error {status}: {data}")
 
 if __name__ == "__main__":
-    asyncio.run(check_wallet_activity())
+    parser = argparse.ArgumentParser(description="Probe Data API /trades for a wallet")
+    parser.add_argument("--full", action="store_true", help="also probe maker_address and taker_address")
+    args = parser.parse_args()
+    asyncio.run(run(check_wallet_activity(args.full)))